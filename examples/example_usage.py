@@ -13,7 +13,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "tools"))
 
 from spectral_signature_loader import SpectralSignatureLoader
 from signature_creator import create_signature_from_array
-from signature_comparison import compare_signatures, plot_multiple_signatures
+from signature_comparison import compare_signatures, BAND_NAMES
 from signature_validator import SignatureValidator
 from signature_plotter import plot_signature, plot_gold_pathfinders
 import numpy as np
@@ -69,8 +69,7 @@ def example_create_signature():
     # Save example
     output_dir = Path(__file__).parent.parent / "examples"
     output_dir.mkdir(exist_ok=True)
-    signature.save_csv(output_dir / "example_high_gold_001.csv")
-    signature.save_json(output_dir / "example_high_gold_001.json")
+    signature.save_both(output_dir / "example_high_gold_001")
     print(f"\nSaved to: {output_dir}/")
     
     return signature
@@ -142,10 +141,12 @@ def example_compare_signatures():
     print(f"Euclidean Distance: {comparison['euclidean_distance']:.3f}")
     print(f"Correlation: {comparison['correlation']:.3f}")
     print(f"Separability: {comparison['separability']:.3f}")
+    key_diffs = comparison['key_differences']
     print(f"\nKey Differences:")
-    for diff in comparison['key_differences']:
-        print(f"  {diff['band_name']}: {diff['value1']:.1f} vs {diff['value2']:.1f} "
-              f"(diff: {diff['difference']:.1f})")
+    for band_num, val1, val2, diff in zip(key_diffs.band_numbers, key_diffs.values1,
+                                          key_diffs.values2, key_diffs.differences):
+        print(f"  {BAND_NAMES[band_num]}: {val1:.1f} vs {val2:.1f} "
+              f"(diff: {diff:.1f})")
 
 
 def example_validate_signature():
@@ -202,9 +203,9 @@ def example_plot_signature():
     sig2 = example_create_signature()
     sig2.signature_id = "background_example"
     # Modify to create background signature
-    for band in sig2.bands:
-        if band['band_number'] >= 13:
-            band['index_value'] = band.get('index_value', 0) * 0.2
+    for band_number in range(13, 19):
+        index_value = sig2.get_index_value(band_number) or 0
+        sig2.set_index_value(band_number, index_value * 0.2)
     
     plot_gold_pathfinders(
         [sig, sig2],
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Fast Metric Kernels
+===================
+Single-pass comparison kernels, numba-compiled when numba is installed
+"""
+
+import math
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _pair_metrics_numpy(values1: np.ndarray, values2: np.ndarray) -> tuple:
+    """Pure-NumPy single-pass metric triple (fallback when numba is absent)
+
+    Returns:
+        Tuple of (euclidean_distance, correlation, separability)
+    """
+    diff = values1 - values2
+    euclidean = float(np.sqrt(diff @ diff))
+
+    mask = ~(np.isnan(values1) | np.isnan(values2))
+    v1 = values1[mask]
+    v2 = values2[mask]
+    n = v1.size
+    if n < 2:
+        return euclidean, 0.0, 0.0
+
+    s1 = float(v1.sum())
+    s2 = float(v2.sum())
+    s11 = float(v1 @ v1)
+    s22 = float(v2 @ v2)
+    s12 = float(v1 @ v2)
+
+    return euclidean, *_metrics_from_sums(n, s1, s2, s11, s22, s12)
+
+
+def _metrics_from_sums(n, s1, s2, s11, s22, s12) -> tuple:
+    """Derive (correlation, separability) from shared running sums"""
+    numerator = n * s12 - s1 * s2
+    denominator_sq = (n * s11 - s1 * s1) * (n * s22 - s2 * s2)
+    correlation = numerator / math.sqrt(denominator_sq) if denominator_sq > 0 else 0.0
+
+    mean1 = s1 / n
+    mean2 = s2 / n
+    std1 = math.sqrt(max(s11 / n - mean1 * mean1, 0.0))
+    std2 = math.sqrt(max(s22 / n - mean2 * mean2, 0.0))
+
+    if std1 == 0 or std2 == 0:
+        separability = 0.0
+    else:
+        separability = 2 * (1 - math.exp(-0.125 * ((mean1 - mean2) ** 2) /
+                                         ((std1 + std2) / 2) ** 2))
+        separability = min(separability, 2.0)
+
+    return correlation, separability
+
+
+def _value_stats_numpy(values: np.ndarray) -> tuple:
+    """Mean/std/min/max of a value vector (fallback when numba is absent)
+
+    Returns:
+        Tuple of (mean, std, min, max)
+    """
+    return (float(values.mean()), float(values.std()),
+            float(values.min()), float(values.max()))
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _value_stats_numba(values):  # pragma: no cover - needs numba
+        """Single-pass mean/std/min/max using Welford's update"""
+        mean = 0.0
+        m2 = 0.0
+        minimum = values[0]
+        maximum = values[0]
+        for i in range(values.shape[0]):
+            x = values[i]
+            if x < minimum:
+                minimum = x
+            if x > maximum:
+                maximum = x
+            delta = x - mean
+            mean += delta / (i + 1)
+            m2 += delta * (x - mean)
+        return mean, math.sqrt(m2 / values.shape[0]), minimum, maximum
+
+    @njit(cache=True, fastmath=True)
+    def _pair_metrics_numba(values1, values2):  # pragma: no cover - needs numba
+        """Jitted metric triple; NaN pairs are skipped via the x != x check"""
+        n = 0
+        s1 = 0.0
+        s2 = 0.0
+        s11 = 0.0
+        s22 = 0.0
+        s12 = 0.0
+        sq_diff = 0.0
+        for i in range(values1.shape[0]):
+            a = values1[i]
+            b = values2[i]
+            d = a - b
+            sq_diff += d * d
+            if a == a and b == b:
+                n += 1
+                s1 += a
+                s2 += b
+                s11 += a * a
+                s22 += b * b
+                s12 += a * b
+
+        euclidean = math.sqrt(sq_diff)
+        if n < 2:
+            return euclidean, 0.0, 0.0
+
+        numerator = n * s12 - s1 * s2
+        denominator_sq = (n * s11 - s1 * s1) * (n * s22 - s2 * s2)
+        correlation = numerator / math.sqrt(denominator_sq) if denominator_sq > 0 else 0.0
+
+        mean1 = s1 / n
+        mean2 = s2 / n
+        std1 = math.sqrt(max(s11 / n - mean1 * mean1, 0.0))
+        std2 = math.sqrt(max(s22 / n - mean2 * mean2, 0.0))
+
+        if std1 == 0 or std2 == 0:
+            separability = 0.0
+        else:
+            separability = 2 * (1 - math.exp(-0.125 * ((mean1 - mean2) ** 2) /
+                                             ((std1 + std2) / 2) ** 2))
+            separability = min(separability, 2.0)
+
+        return euclidean, correlation, separability
+
+    try:
+        # Warm up the compiles at import so first real calls are fast
+        _pair_metrics_numba(np.zeros(2), np.zeros(2))
+        _value_stats_numba(np.zeros(2))
+        pair_metrics = _pair_metrics_numba
+        value_stats = _value_stats_numba
+    except Exception:
+        pair_metrics = _pair_metrics_numpy
+        value_stats = _value_stats_numpy
+else:
+    pair_metrics = _pair_metrics_numpy
+    value_stats = _value_stats_numpy
@@ -5,9 +5,56 @@ Spectral Signature Comparison
 Compare multiple spectral signatures and calculate separability metrics
 """
 
+import math
+from collections import namedtuple
+
 import numpy as np
 from typing import Dict, List, Tuple
-from spectral_signature_loader import SpectralSignature
+from spectral_signature_loader import SpectralSignature, SpectralSignatureLoader
+from _fast_metrics import pair_metrics
+
+try:
+    from scipy.spatial.distance import pdist, squareform
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+# Band names indexed by band number (1-18); index 0 is unused
+BAND_NAMES = tuple([None] + [band['band_name']
+                             for band in SpectralSignatureLoader.ASTER_BANDS])
+
+
+# Columnar focus-band differences: parallel arrays instead of per-band dicts
+KeyDiffs = namedtuple('KeyDiffs', ['band_numbers', 'values1', 'values2',
+                                   'differences', 'percent_differences'])
+
+
+def _band_name(band_number: int) -> str:
+    """Look up the standard ASTER band name for a band number"""
+    if 0 < band_number < len(BAND_NAMES):
+        return BAND_NAMES[band_number]
+    return f'Band_{band_number}'
+
+
+def _pair_metrics(values1: np.ndarray, values2: np.ndarray) -> Dict:
+    """Compute euclidean distance, correlation, and separability in one pass
+
+    Dispatches to the single-pass kernel in _fast_metrics, which is
+    numba-compiled when numba is installed and pure NumPy otherwise.
+
+    Args:
+        values1: First value vector
+        values2: Second value vector
+
+    Returns:
+        Dictionary with 'euclidean_distance', 'correlation', 'separability'
+    """
+    euclidean, correlation, separability = pair_metrics(
+        np.asarray(values1, dtype=np.float64),
+        np.asarray(values2, dtype=np.float64))
+    return {'euclidean_distance': euclidean,
+            'correlation': correlation,
+            'separability': separability}
 
 
 def calculate_euclidean_distance(sig1: SpectralSignature, sig2: SpectralSignature, 
@@ -22,10 +69,8 @@ def calculate_euclidean_distance(sig1: SpectralSignature, sig2: SpectralSignatur
     Returns:
         Euclidean distance
     """
-    values1 = sig1.get_all_values(value_type)
-    values2 = sig2.get_all_values(value_type)
-    
-    return float(np.linalg.norm(values1 - values2))
+    diff = sig1.get_all_values(value_type) - sig2.get_all_values(value_type)
+    return math.sqrt(diff @ diff)
 
 
 def calculate_correlation(sig1: SpectralSignature, sig2: SpectralSignature,
@@ -42,17 +87,40 @@ def calculate_correlation(sig1: SpectralSignature, sig2: SpectralSignature,
     """
     values1 = sig1.get_all_values(value_type)
     values2 = sig2.get_all_values(value_type)
-    
-    # Remove any NaN values
+
+    # Fast path: no NaN values to mask (the common case for collected data)
+    if np.isfinite(values1).all() and np.isfinite(values2).all():
+        return _pearson(values1, values2)
+
     mask = ~(np.isnan(values1) | np.isnan(values2))
     if np.sum(mask) < 2:
         return 0.0
-    
-    values1_clean = values1[mask]
-    values2_clean = values2[mask]
-    
-    correlation = np.corrcoef(values1_clean, values2_clean)[0, 1]
-    return float(correlation) if not np.isnan(correlation) else 0.0
+
+    return _pearson(values1[mask], values2[mask])
+
+
+def _pearson(values1: np.ndarray, values2: np.ndarray) -> float:
+    """One-pass Pearson correlation of two NaN-free vectors
+
+    Uses the textbook running-sum formula; avoids the 2x2 covariance
+    matrix np.corrcoef builds per call. Inputs are upcast to float64 so
+    the n*s11 - s1^2 cancellation stays well conditioned for float32
+    storage.
+    """
+    values1 = values1.astype(np.float64, copy=False)
+    values2 = values2.astype(np.float64, copy=False)
+    n = values1.size
+    s1 = float(values1.sum())
+    s2 = float(values2.sum())
+    s11 = float(values1 @ values1)
+    s22 = float(values2 @ values2)
+    s12 = float(values1 @ values2)
+
+    numerator = n * s12 - s1 * s2
+    denominator_sq = (n * s11 - s1 * s1) * (n * s22 - s2 * s2)
+    if denominator_sq <= 0:
+        return 0.0
+    return numerator / math.sqrt(denominator_sq)
 
 
 def calculate_separability(sig1: SpectralSignature, sig2: SpectralSignature,
@@ -69,88 +137,113 @@ def calculate_separability(sig1: SpectralSignature, sig2: SpectralSignature,
     """
     values1 = sig1.get_all_values(value_type)
     values2 = sig2.get_all_values(value_type)
-    
-    # Remove NaN values
-    mask = ~(np.isnan(values1) | np.isnan(values2))
-    if np.sum(mask) < 2:
-        return 0.0
-    
-    values1_clean = values1[mask]
-    values2_clean = values2[mask]
-    
-    # Calculate means and covariances
-    mean1 = np.mean(values1_clean)
-    mean2 = np.mean(values2_clean)
-    std1 = np.std(values1_clean)
-    std2 = np.std(values2_clean)
-    
+
+    # Fast path: no NaN values to mask (the common case for collected data)
+    if np.isfinite(values1).all() and np.isfinite(values2).all():
+        values1_clean = values1
+        values2_clean = values2
+    else:
+        mask = ~(np.isnan(values1) | np.isnan(values2))
+        if np.sum(mask) < 2:
+            return 0.0
+        values1_clean = values1[mask]
+        values2_clean = values2[mask]
+
+    # Derive means and stds from the same running sums as the Pearson path
+    values1_clean = values1_clean.astype(np.float64, copy=False)
+    values2_clean = values2_clean.astype(np.float64, copy=False)
+    n = values1_clean.size
+    mean1 = float(values1_clean.sum()) / n
+    mean2 = float(values2_clean.sum()) / n
+    std1 = math.sqrt(max(float(values1_clean @ values1_clean) / n - mean1 * mean1, 0.0))
+    std2 = math.sqrt(max(float(values2_clean @ values2_clean) / n - mean2 * mean2, 0.0))
+
     # Simplified separability (Bhattacharyya distance approximation)
     if std1 == 0 or std2 == 0:
         return 0.0
-    
-    separability = 2 * (1 - np.exp(-0.125 * ((mean1 - mean2) ** 2) / ((std1 + std2) / 2) ** 2))
+
+    separability = 2 * (1 - math.exp(-0.125 * ((mean1 - mean2) ** 2) / ((std1 + std2) / 2) ** 2))
     return float(min(separability, 2.0))
 
 
 def compare_signatures(sig1: SpectralSignature, sig2: SpectralSignature,
-                      focus_bands: List[int] = None) -> Dict:
+                      focus_bands: List[int] = None,
+                      as_records: bool = False) -> Dict:
     """Comprehensive comparison of two signatures
-    
+
     Args:
         sig1: First spectral signature
         sig2: Second spectral signature
         focus_bands: Optional list of band numbers to focus on (e.g., [13, 16] for gold)
-    
+        as_records: With focus_bands, return key_differences as the legacy
+            list of per-band dicts instead of a columnar KeyDiffs tuple
+
     Returns:
         Dictionary with comparison metrics
     """
-    comparison = {
-        'euclidean_distance': calculate_euclidean_distance(sig1, sig2),
-        'correlation': calculate_correlation(sig1, sig2),
-        'separability': calculate_separability(sig1, sig2),
-        'key_differences': []
-    }
-    
+    comparison = _pair_metrics(sig1.get_all_values(), sig2.get_all_values())
+    comparison['key_differences'] = []
+
     # Focus on specific bands if provided (e.g., gold pathfinders)
     if focus_bands:
-        differences = []
-        for band_num in focus_bands:
-            val1 = sig1.get_band_value(band_num) or sig1.get_index_value(band_num)
-            val2 = sig2.get_band_value(band_num) or sig2.get_index_value(band_num)
-            
-            if val1 is not None and val2 is not None:
-                diff = abs(val1 - val2)
-                band_name = sig1.get_band_by_name(f"Band_{band_num}") or {}
-                differences.append({
-                    'band_number': band_num,
-                    'band_name': band_name.get('band_name', f'Band_{band_num}'),
-                    'value1': val1,
-                    'value2': val2,
-                    'difference': diff,
-                    'percent_difference': (diff / max(abs(val1), abs(val2), 0.001)) * 100
-                })
-        
-        comparison['key_differences'] = differences
+        merged1 = sig1.merged_values
+        merged2 = sig2.merged_values
+
+        band_numbers = np.asarray(focus_bands, dtype=np.intp)
+        positions = band_numbers - 1
+        keep = (positions >= 0) & (positions < merged1.size)
+        band_numbers = band_numbers[keep]
+        positions = positions[keep]
+
+        values1 = merged1[positions]
+        values2 = merged2[positions]
+        keep = ~(np.isnan(values1) | np.isnan(values2))
+        band_numbers = band_numbers[keep]
+        values1 = values1[keep]
+        values2 = values2[keep]
+
+        differences = np.abs(values1 - values2)
+        percent = differences / np.maximum(
+            np.maximum(np.abs(values1), np.abs(values2)), 0.001) * 100
+
+        if as_records:
+            comparison['key_differences'] = [
+                {
+                    'band_number': int(number),
+                    'band_name': _band_name(int(number)),
+                    'value1': float(val1),
+                    'value2': float(val2),
+                    'difference': float(diff),
+                    'percent_difference': float(pct)
+                }
+                for number, val1, val2, diff, pct in zip(
+                    band_numbers, values1, values2, differences, percent)
+            ]
+        else:
+            comparison['key_differences'] = KeyDiffs(
+                band_numbers, values1, values2, differences, percent)
     else:
-        # Compare all bands
-        differences = []
-        for i in range(1, 19):
-            val1 = sig1.get_band_value(i) or sig1.get_index_value(i)
-            val2 = sig2.get_band_value(i) or sig2.get_index_value(i)
-            
-            if val1 is not None and val2 is not None:
-                diff = abs(val1 - val2)
-                if diff > 0.01:  # Only report significant differences
-                    band = sig1.get_band_by_name(f"Band_{i}") or {}
-                    differences.append({
-                        'band_number': i,
-                        'band_name': band.get('band_name', f'Band_{i}'),
-                        'value1': val1,
-                        'value2': val2,
-                        'difference': diff
-                    })
-        
-        comparison['key_differences'] = sorted(differences, key=lambda x: x['difference'], reverse=True)[:10]
+        # Compare all bands at once on the merged value vectors
+        values1 = sig1.merged_values
+        values2 = sig2.merged_values
+        diff = np.abs(values1 - values2)
+
+        # Only report significant differences, largest first (top 10)
+        significant = np.flatnonzero(~np.isnan(diff) & (diff > 0.01))
+        if significant.size > 10:
+            significant = significant[np.argpartition(-diff[significant], 10)[:10]]
+        significant = significant[np.argsort(-diff[significant])]
+
+        comparison['key_differences'] = [
+            {
+                'band_number': int(i) + 1,
+                'band_name': _band_name(int(i) + 1),
+                'value1': float(values1[i]),
+                'value2': float(values2[i]),
+                'difference': float(diff[i])
+            }
+            for i in significant
+        ]
     
     return comparison
 
@@ -168,54 +261,140 @@ def find_similar_signatures(target_sig: SpectralSignature,
     Returns:
         List of tuples (signature, correlation) sorted by similarity
     """
+    if not signature_list:
+        return []
+
+    # Correlate the target against all candidates in one batched operation
+    target = np.nan_to_num(target_sig.get_all_values())
+    candidates = np.nan_to_num(_stack_values(signature_list))
+
+    centered_target = target - target.mean()
+    centered_candidates = candidates - candidates.mean(axis=1, keepdims=True)
+
+    numerator = centered_candidates @ centered_target
+    denominator = (np.linalg.norm(centered_candidates, axis=1) *
+                   np.linalg.norm(centered_target))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        correlations = np.where(denominator > 0, numerator / denominator, 0.0)
+
+    # Sort by correlation (highest first), skipping the target itself;
+    # content-identical candidates short-circuit to a perfect correlation
+    target_hash = target_sig.content_hash
     similar = []
-    
-    for sig in signature_list:
-        if sig.signature_id == target_sig.signature_id:
+    for i in np.argsort(-correlations):
+        candidate = signature_list[i]
+        if candidate.signature_id == target_sig.signature_id:
             continue
-        
-        correlation = calculate_correlation(target_sig, sig)
+        correlation = (1.0 if candidate.content_hash == target_hash
+                       else float(correlations[i]))
         if correlation >= threshold:
-            similar.append((sig, correlation))
-    
-    # Sort by correlation (highest first)
-    similar.sort(key=lambda x: x[1], reverse=True)
-    
+            similar.append((candidate, correlation))
+
     return similar
 
 
+def _stack_values(signatures: List[SpectralSignature],
+                  value_type: str = 'reflectance') -> np.ndarray:
+    """Stack signature value vectors into an (n_signatures, n_bands) matrix"""
+    return np.vstack([sig.get_all_values(value_type) for sig in signatures])
+
+
+def _pairwise_matrices(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Compute (similarity, separability) matrices for stacked value rows"""
+    n = values.shape[0]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if SCIPY_AVAILABLE and n > 1:
+            # One C loop over all pairs instead of the full corrcoef setup
+            similarity_matrix = 1 - squareform(pdist(values, metric='correlation'))
+        else:
+            similarity_matrix = np.corrcoef(values)
+    similarity_matrix = np.nan_to_num(similarity_matrix)
+
+    # Pairwise Jeffries-Matusita separability from per-signature mean/std
+    means = values.mean(axis=1)
+    stds = values.std(axis=1)
+    diff_mean_sq = (means[:, None] - means[None, :]) ** 2
+    std_avg_sq = ((stds[:, None] + stds[None, :]) / 2) ** 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        separability_matrix = 2 * (1 - np.exp(-0.125 * diff_mean_sq / std_avg_sq))
+    separability_matrix = np.where(std_avg_sq > 0,
+                                   np.minimum(separability_matrix, 2.0), 0.0)
+    np.fill_diagonal(separability_matrix, 0.0)
+
+    # Set diagonal to 1.0 (perfect self-similarity)
+    np.fill_diagonal(similarity_matrix, 1.0)
+
+    return similarity_matrix, separability_matrix
+
+
 def compare_multiple_signatures(signatures: List[SpectralSignature],
-                               focus_bands: List[int] = None) -> Dict:
+                               focus_bands: List[int] = None,
+                               as_lists: bool = False) -> Dict:
     """Compare multiple signatures and create similarity matrix
-    
+
+    All pairs are compared at once on a stacked (n, bands) matrix: the
+    correlation matrix comes from a single np.corrcoef call and the
+    separability matrix from broadcast mean/std arithmetic, instead of
+    n^2 per-pair Python calls.
+
     Args:
         signatures: List of signatures to compare
         focus_bands: Optional list of band numbers to focus on
-    
+        as_lists: Return the matrices as nested Python lists (e.g. for
+            JSON serialization) instead of ndarrays
+
     Returns:
         Dictionary with similarity matrix and statistics
     """
     n = len(signatures)
-    similarity_matrix = np.zeros((n, n))
-    separability_matrix = np.zeros((n, n))
-    
-    for i in range(n):
-        for j in range(i+1, n):
-            comparison = compare_signatures(signatures[i], signatures[j], focus_bands)
-            similarity_matrix[i, j] = comparison['correlation']
-            similarity_matrix[j, i] = comparison['correlation']
-            separability_matrix[i, j] = comparison['separability']
-            separability_matrix[j, i] = comparison['separability']
-    
-    # Set diagonal to 1.0 (perfect self-similarity)
-    np.fill_diagonal(similarity_matrix, 1.0)
+    values = np.nan_to_num(_stack_values(signatures))
+
+    # Group content-identical signatures so duplicate pairs skip the math:
+    # computing on unique rows and scattering back maps a duplicate pair to
+    # the unique diagonal (1.0 similarity, 0.0 separability)
+    first_occurrence = []
+    hash_positions = {}
+    representative = []
+    for i, sig in enumerate(signatures):
+        position = hash_positions.get(sig.content_hash)
+        if position is None:
+            position = len(first_occurrence)
+            hash_positions[sig.content_hash] = position
+            first_occurrence.append(i)
+        representative.append(position)
+
+    if len(first_occurrence) < n:
+        unique_sim, unique_sep = _pairwise_matrices(values[first_occurrence])
+        representative = np.asarray(representative)
+        similarity_matrix = unique_sim[np.ix_(representative, representative)]
+        separability_matrix = unique_sep[np.ix_(representative, representative)]
+    else:
+        similarity_matrix, separability_matrix = _pairwise_matrices(values)
     
+    # Off-diagonal means without building a boolean mask: the diagonals
+    # are 1.0 / 0.0 by construction, so subtract the trace and divide
+    n_pairs = n * (n - 1)
+    if n_pairs > 0:
+        mean_similarity = (similarity_matrix.sum() - np.trace(similarity_matrix)) / n_pairs
+        mean_separability = separability_matrix.sum() / n_pairs
+    else:
+        mean_similarity = 0.0
+        mean_separability = 0.0
+
+    if as_lists:
+        similarity_out = similarity_matrix.tolist()
+        separability_out = separability_matrix.tolist()
+    else:
+        similarity_out = similarity_matrix
+        separability_out = separability_matrix
+
     return {
-        'similarity_matrix': similarity_matrix.tolist(),
-        'separability_matrix': separability_matrix.tolist(),
+        'similarity_matrix': similarity_out,
+        'separability_matrix': separability_out,
         'signature_ids': [sig.signature_id for sig in signatures],
-        'mean_similarity': float(np.mean(similarity_matrix[similarity_matrix != 1.0])),
-        'mean_separability': float(np.mean(separability_matrix[separability_matrix != 0.0]))
+        'mean_similarity': float(mean_similarity),
+        'mean_separability': float(mean_separability)
     }
 
 
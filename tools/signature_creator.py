@@ -5,6 +5,8 @@ Spectral Signature Creator
 Create spectral signatures from various input formats
 """
 
+import time
+
 import numpy as np
 from pathlib import Path
 from typing import Dict, List, Optional, Union
@@ -12,6 +14,39 @@ from datetime import datetime
 
 from spectral_signature_loader import SpectralSignature, SpectralSignatureLoader
 
+# Standard band definitions, hoisted so each call avoids a loader instance
+ASTER_BANDS = SpectralSignatureLoader.ASTER_BANDS
+
+# Aligned per-field tuples so band construction is a single zip pass
+_BAND_NUMBERS = tuple(band['band_number'] for band in ASTER_BANDS)
+_BAND_NAMES = tuple(band['band_name'] for band in ASTER_BANDS)
+_BAND_WAVELENGTHS = tuple(band.get('wavelength_um') for band in ASTER_BANDS)
+
+
+# Cached creation-date string: [value, refresh deadline]
+_TODAY_CACHE = [None, 0.0]
+
+
+def _today_str() -> str:
+    """Today's date string, refreshed at most once an hour
+
+    datetime.now().strftime is surprisingly costly when signatures are
+    generated in bulk; a coarse TTL is plenty for a creation date.
+    """
+    now = time.monotonic()
+    if _TODAY_CACHE[0] is None or now >= _TODAY_CACHE[1]:
+        _TODAY_CACHE[0] = datetime.now().strftime('%Y-%m-%d')
+        _TODAY_CACHE[1] = now + 3600
+    return _TODAY_CACHE[0]
+
+
+def _optional_values_list(values: Optional[np.ndarray], n_bands: int = 18) -> List:
+    """Convert an optional value array to a float list padded with None"""
+    if values is None:
+        return [None] * n_bands
+    values_list = np.asarray(values, dtype=np.float64).tolist()
+    return values_list[:n_bands] + [None] * (n_bands - len(values_list))
+
 
 def create_signature_from_array(
     band_values: np.ndarray,
@@ -38,39 +73,42 @@ def create_signature_from_array(
     Returns:
         SpectralSignature object
     """
-    loader = SpectralSignatureLoader()
-    
-    if len(band_values) != 18:
-        raise ValueError(f"Expected 18 bands, got {len(band_values)}")
-    
-    bands = []
-    for i, band_def in enumerate(loader.ASTER_BANDS):
-        band_data = {
-            'band_number': band_def['band_number'],
-            'band_name': band_def['band_name'],
-            'wavelength_um': band_def.get('wavelength_um'),
-            'reflectance_value': float(band_values[i]),
-            'continuum_removed': float(continuum_removed[i]) if continuum_removed is not None and i < len(continuum_removed) else None,
-            'index_value': float(index_values[i]) if index_values is not None and i < len(index_values) else None,
+    band_values = np.ascontiguousarray(band_values, dtype=np.float64)
+    if band_values.size != 18:
+        raise ValueError(f"Expected 18 bands, got {band_values.size}")
+
+    # Convert optional arrays to plain float lists once, padded with None
+    reflectance_list = band_values.tolist()
+    cr_list = _optional_values_list(continuum_removed)
+    index_list = _optional_values_list(index_values)
+
+    bands = [
+        {
+            'band_number': number,
+            'band_name': name,
+            'wavelength_um': wavelength,
+            'reflectance_value': refl,
+            'continuum_removed': cr,
+            'index_value': idx,
             'notes': ''
         }
-        bands.append(band_data)
-    
-    # Calculate statistics
-    reflectance_values = [b['reflectance_value'] for b in bands if b['reflectance_value'] is not None]
-    statistics = {}
-    if reflectance_values:
-        statistics = {
-            'mean_reflectance': float(np.mean(reflectance_values)),
-            'std_reflectance': float(np.std(reflectance_values)),
-            'min_reflectance': float(np.min(reflectance_values)),
-            'max_reflectance': float(np.max(reflectance_values))
-        }
+        for number, name, wavelength, refl, cr, idx in zip(
+            _BAND_NUMBERS, _BAND_NAMES, _BAND_WAVELENGTHS,
+            reflectance_list, cr_list, index_list)
+    ]
+
+    # Calculate statistics directly on the input array
+    statistics = {
+        'mean_reflectance': float(band_values.mean()),
+        'std_reflectance': float(band_values.std()),
+        'min_reflectance': float(band_values.min()),
+        'max_reflectance': float(band_values.max())
+    }
     
     # Add creation metadata
     if metadata is None:
         metadata = {}
-    metadata['created_date'] = datetime.now().strftime('%Y-%m-%d')
+    metadata['created_date'] = _today_str()
     metadata['created_by'] = metadata.get('created_by', 'unknown')
     
     return SpectralSignature(
@@ -191,10 +229,9 @@ def create_signature_template(
     # Save template
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
-    
-    signature.save_csv(output_dir / f"{signature_id}.csv")
-    signature.save_json(output_dir / f"{signature_id}.json")
-    
+
+    signature.save_both(output_dir / signature_id)
+
     return signature
 
 
@@ -204,7 +241,8 @@ if __name__ == "__main__":
     print("=" * 50)
     
     # Example: Create from array
-    example_values = np.random.rand(18) * 0.3 + 0.1  # Random values between 0.1-0.4
+    rng = np.random.default_rng()
+    example_values = rng.random(18) * 0.3 + 0.1  # Random values between 0.1-0.4
     example_index_values = np.array([0] * 12 + [150, 120, 100, 180, 110, 90])  # Example gold indices
     
     signature = create_signature_from_array(
@@ -233,7 +271,6 @@ if __name__ == "__main__":
     # Save example
     output_dir = Path("examples")
     output_dir.mkdir(exist_ok=True)
-    signature.save_csv(output_dir / "example_signature_001.csv")
-    signature.save_json(output_dir / "example_signature_001.json")
+    signature.save_both(output_dir / "example_signature_001")
     print(f"\nSaved to: {output_dir}/")
 
@@ -5,20 +5,214 @@ Spectral Signature Plotter
 Visualize spectral signatures with matplotlib
 """
 
-import matplotlib.pyplot as plt
 import numpy as np
+from functools import lru_cache
 from typing import List, Optional
 from spectral_signature_loader import SpectralSignature
 
+# pyplot is imported lazily: matplotlib costs hundreds of milliseconds
+# on cold start and validator-only workflows never plot anything
+_PLT = None
 
-def plot_signature(signature: SpectralSignature, 
+
+def _get_plt(headless: bool = False):
+    """Import and cache matplotlib.pyplot on first plotting call
+
+    Args:
+        headless: Select the Agg backend, skipping GUI backend setup;
+            only effective before the first pyplot import
+    """
+    global _PLT
+    if _PLT is None:
+        if headless:
+            import matplotlib
+            matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        _PLT = plt
+    return _PLT
+
+# Band-group layout shared by every plot: separator lines between the
+# raw SWIR, continuum-removed and gold-index groups, and label midpoints
+GROUP_SEPARATORS = (6.5, 12.5)
+GROUP_LABELS = ((3.5, 'Raw SWIR'), (9.5, 'CR SWIR'), (15.5, 'Gold Indices'))
+
+
+@lru_cache(maxsize=16)
+def _signature_colors(n: int) -> np.ndarray:
+    """Pick n colors from the discrete tab palettes, cached across calls
+
+    tab10/tab20 are discrete palettes, so indexing their color tuples
+    directly avoids continuous-colormap resampling and the collisions
+    it produces once n exceeds the palette size.
+    """
+    plt = _get_plt()
+    base = plt.cm.tab20.colors if n > 10 else plt.cm.tab10.colors
+    return np.array([base[i % len(base)] for i in range(n)])
+
+
+class SignaturePlotter:
+    """Reusable single-signature plotter that keeps one figure alive
+
+    Building a fresh Figure/Axes dominates runtime for these 18-point
+    plots, so repeated plotting (interactive use, batch exports) reuses
+    the same axes and swaps line data in place whenever the requested
+    plot options match the previous call.
+    """
+
+    def __init__(self, figsize: tuple = (12, 6)):
+        self.figsize = figsize
+        self.fig = None
+        self.ax = None
+        self._ax2 = None
+        self._line = None
+        self._cr_line = None
+        self._bars = ()
+        self._group_labels = ()
+        self._options = None
+
+    def plot(self, signature: SpectralSignature,
+             value_type: str = 'reflectance',
+             show_continuum_removed: bool = False,
+             show_indices: bool = False,
+             save_path: Optional[str] = None):
+        """Plot a single spectral signature, reusing the figure if possible
+
+        Args:
+            signature: SpectralSignature to plot
+            value_type: 'reflectance', 'continuum_removed', or 'index'
+            show_continuum_removed: Whether to overlay continuum-removed values
+            show_indices: Whether to show index values for bands 13-18
+            save_path: Optional path to save figure
+        """
+        plt = _get_plt(headless=save_path is not None)
+        band_numbers = signature.sorted_band_numbers
+
+        if value_type == 'reflectance':
+            values = signature.get_all_values('reflectance')
+            ylabel = 'Reflectance'
+            title = f'Spectral Signature: {signature.signature_id}'
+        elif value_type == 'index':
+            values = signature.get_all_values('index')
+            ylabel = 'Index Value'
+            title = f'Gold Pathfinder Indices: {signature.signature_id}'
+        else:
+            values = signature.get_all_values('continuum_removed')
+            ylabel = 'Continuum Removed Reflectance'
+            title = f'Continuum Removed Signature: {signature.signature_id}'
+
+        if self.fig is None:
+            self.fig, self.ax = plt.subplots(figsize=self.figsize,
+                                             constrained_layout=True)
+
+        options = (value_type, show_continuum_removed, show_indices)
+        if options == self._options and not self._update_in_place(signature, band_numbers, values):
+            self._options = None
+        if options != self._options:
+            self._rebuild(signature, band_numbers, values, ylabel,
+                          show_continuum_removed, show_indices, value_type)
+            self._options = options
+
+        self.ax.set_title(title)
+        ymax = self.ax.get_ylim()[1]
+        for x, label in self._group_labels:
+            label.set_position((x, ymax * 0.95))
+
+        if save_path:
+            self.fig.savefig(save_path, dpi=300)
+            print(f"Saved plot to: {save_path}")
+        else:
+            plt.show()
+
+    def _update_in_place(self, signature, band_numbers, values) -> bool:
+        """Swap data into existing artists; False means a rebuild is needed"""
+        if self._cr_line is not None:
+            cr_values = signature.get_all_values('continuum_removed')
+            if not np.any(~np.isnan(cr_values)):
+                return False
+            self._cr_line.set_data(band_numbers, cr_values)
+
+        if self._bars:
+            all_indices = signature.get_all_values('index')
+            pathfinder = (np.asarray(band_numbers) >= 13) & ~np.isnan(all_indices)
+            index_values = all_indices[pathfinder]
+            if index_values.size != len(self._bars):
+                return False
+            for bar, value in zip(self._bars, index_values):
+                bar.set_height(value)
+            self._ax2.relim()
+            self._ax2.autoscale_view()
+
+        self._line.set_data(band_numbers, values)
+        self.ax.relim()
+        self.ax.autoscale_view()
+        return True
+
+    def _rebuild(self, signature, band_numbers, values, ylabel,
+                 show_continuum_removed, show_indices, value_type):
+        """Redraw the axes from scratch inside the existing figure"""
+        if self._ax2 is not None:
+            self._ax2.remove()
+            self._ax2 = None
+        self.ax.clear()
+        self._cr_line = None
+        self._bars = ()
+        ax = self.ax
+
+        # Plot main values; rasterize the data artists so vector exports
+        # keep axes/labels as vectors without embedding every marker path
+        self._line, = ax.plot(band_numbers, values, 'o-', linewidth=2, markersize=8,
+                              label=value_type.title())
+        self._line.set_rasterized(True)
+
+        # Overlay continuum removed if requested
+        if show_continuum_removed and value_type == 'reflectance':
+            cr_values = signature.get_all_values('continuum_removed')
+            if np.any(~np.isnan(cr_values)):
+                self._cr_line, = ax.plot(band_numbers, cr_values, 's--', linewidth=1.5,
+                                         markersize=6, alpha=0.7, label='Continuum Removed')
+                self._cr_line.set_rasterized(True)
+
+        # Highlight gold pathfinder bands (13-18)
+        if show_indices or value_type == 'index':
+            all_indices = signature.get_all_values('index')
+            pathfinder = (np.asarray(band_numbers) >= 13) & ~np.isnan(all_indices)
+            index_bands = np.asarray(band_numbers)[pathfinder]
+            index_values = all_indices[pathfinder]
+
+            if index_values.size:
+                self._ax2 = ax.twinx()
+                self._bars = self._ax2.bar(index_bands, index_values, alpha=0.3,
+                                           color='gold', label='Gold Indices')
+                for bar in self._bars:
+                    bar.set_rasterized(True)
+                self._ax2.set_ylabel('Index Value', color='gold')
+                self._ax2.tick_params(axis='y', labelcolor='gold')
+
+        # Add vertical lines separating band groups
+        for x in GROUP_SEPARATORS:
+            ax.axvline(x=x, color='gray', linestyle='--', alpha=0.3, linewidth=1)
+
+        # Add labels
+        ax.set_xlabel('Band Number')
+        ax.set_ylabel(ylabel)
+        ax.grid(True, alpha=0.3)
+        ax.legend(loc='best')
+
+        # Add band group labels (repositioned after autoscaling on reuse)
+        ymax = ax.get_ylim()[1]
+        self._group_labels = tuple(
+            (x, ax.text(x, ymax * 0.95, text, ha='center', fontsize=9, alpha=0.7))
+            for x, text in GROUP_LABELS)
+
+
+def plot_signature(signature: SpectralSignature,
                    value_type: str = 'reflectance',
                    show_continuum_removed: bool = False,
                    show_indices: bool = False,
                    save_path: Optional[str] = None,
                    figsize: tuple = (12, 6)):
     """Plot a single spectral signature
-    
+
     Args:
         signature: SpectralSignature to plot
         value_type: 'reflectance', 'continuum_removed', or 'index'
@@ -27,73 +221,12 @@ def plot_signature(signature: SpectralSignature,
         save_path: Optional path to save figure
         figsize: Figure size tuple
     """
-    fig, ax = plt.subplots(figsize=figsize)
-    
-    band_numbers = [b['band_number'] for b in sorted(signature.bands, key=lambda x: x.get('band_number', 0))]
-    
-    if value_type == 'reflectance':
-        values = signature.get_all_values('reflectance')
-        ylabel = 'Reflectance'
-        title = f'Spectral Signature: {signature.signature_id}'
-    elif value_type == 'index':
-        values = signature.get_all_values('index')
-        ylabel = 'Index Value'
-        title = f'Gold Pathfinder Indices: {signature.signature_id}'
-    else:
-        values = signature.get_all_values('continuum_removed')
-        ylabel = 'Continuum Removed Reflectance'
-        title = f'Continuum Removed Signature: {signature.signature_id}'
-    
-    # Plot main values
-    ax.plot(band_numbers, values, 'o-', linewidth=2, markersize=8, label=value_type.title())
-    
-    # Overlay continuum removed if requested
-    if show_continuum_removed and value_type == 'reflectance':
-        cr_values = signature.get_all_values('continuum_removed')
-        if np.any(~np.isnan(cr_values)):
-            ax.plot(band_numbers, cr_values, 's--', linewidth=1.5, markersize=6, 
-                   alpha=0.7, label='Continuum Removed')
-    
-    # Highlight gold pathfinder bands (13-18)
-    if show_indices or value_type == 'index':
-        index_values = []
-        index_bands = []
-        for band in sorted(signature.bands, key=lambda x: x.get('band_number', 0)):
-            if band.get('band_number', 0) >= 13:
-                idx_val = band.get('index_value')
-                if idx_val is not None:
-                    index_values.append(idx_val)
-                    index_bands.append(band.get('band_number'))
-        
-        if index_values:
-            ax2 = ax.twinx()
-            ax2.bar(index_bands, index_values, alpha=0.3, color='gold', label='Gold Indices')
-            ax2.set_ylabel('Index Value', color='gold')
-            ax2.tick_params(axis='y', labelcolor='gold')
-    
-    # Add vertical lines separating band groups
-    ax.axvline(x=6.5, color='gray', linestyle='--', alpha=0.3, linewidth=1)
-    ax.axvline(x=12.5, color='gray', linestyle='--', alpha=0.3, linewidth=1)
-    
-    # Add labels
-    ax.set_xlabel('Band Number')
-    ax.set_ylabel(ylabel)
-    ax.set_title(title)
-    ax.grid(True, alpha=0.3)
-    ax.legend(loc='best')
-    
-    # Add band group labels
-    ax.text(3.5, ax.get_ylim()[1] * 0.95, 'Raw SWIR', ha='center', fontsize=9, alpha=0.7)
-    ax.text(9.5, ax.get_ylim()[1] * 0.95, 'CR SWIR', ha='center', fontsize=9, alpha=0.7)
-    ax.text(15.5, ax.get_ylim()[1] * 0.95, 'Gold Indices', ha='center', fontsize=9, alpha=0.7)
-    
-    plt.tight_layout()
-    
-    if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        print(f"Saved plot to: {save_path}")
-    else:
-        plt.show()
+    SignaturePlotter(figsize=figsize).plot(
+        signature,
+        value_type=value_type,
+        show_continuum_removed=show_continuum_removed,
+        show_indices=show_indices,
+        save_path=save_path)
 
 
 def plot_multiple_signatures(signatures: List[SpectralSignature],
@@ -110,39 +243,57 @@ def plot_multiple_signatures(signatures: List[SpectralSignature],
         save_path: Optional path to save figure
         figsize: Figure size tuple
     """
-    fig, ax = plt.subplots(figsize=figsize)
-    
+    plt = _get_plt(headless=save_path is not None)
+    from matplotlib.collections import LineCollection
+
+    fig, ax = plt.subplots(figsize=figsize, constrained_layout=True)
+
     if labels is None:
         labels = [sig.signature_id for sig in signatures]
-    
-    colors = plt.cm.tab10(np.linspace(0, 1, len(signatures)))
-    
-    for sig, label, color in zip(signatures, labels, colors):
-        band_numbers = [b['band_number'] for b in sorted(sig.bands, key=lambda x: x.get('band_number', 0))]
-        values = sig.get_all_values(value_type)
-        ax.plot(band_numbers, values, 'o-', linewidth=2, markersize=6, 
-               label=label, color=color, alpha=0.8)
-    
+
+    colors = _signature_colors(len(signatures))
+
+    # One LineCollection instead of N ax.plot calls: a single artist is
+    # much faster to draw and lighter in memory for many signatures
+    segments = [np.column_stack([sig.sorted_band_numbers, sig.get_all_values(value_type)])
+                for sig in signatures]
+    collection = LineCollection(segments, colors=colors, linewidths=2, alpha=0.8)
+    collection.set_rasterized(True)
+    ax.add_collection(collection)
+
+    # Markers for all signatures in one scatter call
+    points = np.concatenate(segments)
+    marker_colors = np.repeat(colors, [len(segment) for segment in segments], axis=0)
+    markers = ax.scatter(points[:, 0], points[:, 1], s=36, c=marker_colors, alpha=0.8)
+    markers.set_rasterized(True)
+
+    # Collections don't autoscale on their own; feed the finite points in
+    ax.update_datalim(points[np.isfinite(points[:, 1])])
+    ax.autoscale_view()
+
     # Add vertical lines
-    ax.axvline(x=6.5, color='gray', linestyle='--', alpha=0.3, linewidth=1)
-    ax.axvline(x=12.5, color='gray', linestyle='--', alpha=0.3, linewidth=1)
+    for x in GROUP_SEPARATORS:
+        ax.axvline(x=x, color='gray', linestyle='--', alpha=0.3, linewidth=1)
     
     ylabel = value_type.replace('_', ' ').title()
     ax.set_xlabel('Band Number')
     ax.set_ylabel(ylabel)
     ax.set_title('Spectral Signature Comparison')
     ax.grid(True, alpha=0.3)
-    ax.legend(loc='best', fontsize=9)
+
+    # Proxy artists for the legend, since the collection is one artist
+    from matplotlib.lines import Line2D
+    handles = [Line2D([0], [0], color=color, marker='o', linewidth=2, markersize=6)
+               for color in colors]
+    ax.legend(handles, labels, loc='best', fontsize=9)
     
     # Add band group labels
-    ax.text(3.5, ax.get_ylim()[1] * 0.95, 'Raw SWIR', ha='center', fontsize=9, alpha=0.7)
-    ax.text(9.5, ax.get_ylim()[1] * 0.95, 'CR SWIR', ha='center', fontsize=9, alpha=0.7)
-    ax.text(15.5, ax.get_ylim()[1] * 0.95, 'Gold Indices', ha='center', fontsize=9, alpha=0.7)
-    
-    plt.tight_layout()
+    ymax = ax.get_ylim()[1]
+    for x, text in GROUP_LABELS:
+        ax.text(x, ymax * 0.95, text, ha='center', fontsize=9, alpha=0.7)
     
     if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        plt.savefig(save_path, dpi=300)
         print(f"Saved plot to: {save_path}")
     else:
         plt.show()
@@ -160,13 +311,14 @@ def plot_gold_pathfinders(signatures: List[SpectralSignature],
         save_path: Optional path to save figure
         figsize: Figure size tuple
     """
-    fig, ax = plt.subplots(figsize=figsize)
-    
+    plt = _get_plt(headless=save_path is not None)
+    fig, ax = plt.subplots(figsize=figsize, constrained_layout=True)
+
     if labels is None:
         labels = [sig.signature_id for sig in signatures]
-    
-    colors = plt.cm.tab10(np.linspace(0, 1, len(signatures)))
-    
+
+    colors = _signature_colors(len(signatures))
+
     band_names = ['Phyllic\nSericite', 'Argillic\nKaolinite', 'Propylitic\nChlorite',
                   'Composite\nGold', 'Hydrothermal\nIntensity', 'Advanced\nArgillic']
     band_numbers = [13, 14, 15, 16, 17, 18]
@@ -177,7 +329,9 @@ def plot_gold_pathfinders(signatures: List[SpectralSignature],
     for i, (sig, label, color) in enumerate(zip(signatures, labels, colors)):
         values = [sig.get_index_value(bn) or 0 for bn in band_numbers]
         offset = (i - len(signatures)/2 + 0.5) * width
-        ax.bar(x_pos + offset, values, width, label=label, color=color, alpha=0.8)
+        bars = ax.bar(x_pos + offset, values, width, label=label, color=color, alpha=0.8)
+        for bar in bars:
+            bar.set_rasterized(True)
     
     ax.set_xlabel('Gold Pathfinder Index')
     ax.set_ylabel('Index Value')
@@ -187,10 +341,8 @@ def plot_gold_pathfinders(signatures: List[SpectralSignature],
     ax.legend(loc='best')
     ax.grid(True, alpha=0.3, axis='y')
     
-    plt.tight_layout()
-    
     if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        plt.savefig(save_path, dpi=300)
         print(f"Saved plot to: {save_path}")
     else:
         plt.show()
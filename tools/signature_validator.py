@@ -6,8 +6,10 @@ Validate spectral signatures for format compliance and quality
 """
 
 import json
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from spectral_signature_loader import SpectralSignature, SpectralSignatureLoader
 
 
@@ -16,6 +18,12 @@ class ValidationError(Exception):
     pass
 
 
+def _validate_one(args: Tuple[Path, str]) -> Tuple[bool, List[str]]:
+    """Validate a single file; module-level so worker processes can pickle it"""
+    filepath, file_format = args
+    return SignatureValidator().validate_file(filepath, file_format)
+
+
 class SignatureValidator:
     """Validator for spectral signatures"""
     
@@ -44,42 +52,36 @@ class SignatureValidator:
         elif signature.category not in self.VALID_CATEGORIES:
             errors.append(f"Invalid category: {signature.category}. Must be one of {self.VALID_CATEGORIES}")
         
-        # Check band count
-        if len(signature.bands) != self.EXPECTED_BAND_COUNT:
-            errors.append(f"Expected {self.EXPECTED_BAND_COUNT} bands, found {len(signature.bands)}")
-        
-        # Check band structure
-        band_numbers = []
-        for i, band in enumerate(signature.bands):
-            # Check required fields
-            if 'band_number' not in band:
-                errors.append(f"Band {i+1}: Missing band_number")
-            else:
-                band_num = band['band_number']
-                if band_num in band_numbers:
-                    errors.append(f"Duplicate band_number: {band_num}")
-                band_numbers.append(band_num)
-            
-            if 'band_name' not in band or not band['band_name']:
-                errors.append(f"Band {band_num}: Missing or empty band_name")
-            
-            if 'reflectance_value' not in band:
-                errors.append(f"Band {band_num}: Missing reflectance_value")
-            else:
-                val = band['reflectance_value']
-                if val is None:
-                    errors.append(f"Band {band_num}: reflectance_value is None")
-                elif not isinstance(val, (int, float)):
-                    errors.append(f"Band {band_num}: reflectance_value must be numeric")
-                elif val < 0 or val > 1:
-                    # Warn but don't error (values might be scaled differently)
-                    pass
-        
-        # Check band number sequence
-        if len(band_numbers) == self.EXPECTED_BAND_COUNT:
-            expected_numbers = list(range(1, self.EXPECTED_BAND_COUNT + 1))
-            if sorted(band_numbers) != expected_numbers:
-                errors.append(f"Band numbers should be 1-{self.EXPECTED_BAND_COUNT}, found: {sorted(band_numbers)}")
+        # Check band count against the signature's backing arrays; the
+        # per-band checks below run as whole-array masks rather than a
+        # Python loop with repeated dict lookups
+        band_numbers = signature._band_numbers
+        reflectance = signature._reflectance
+
+        if band_numbers.size != self.EXPECTED_BAND_COUNT:
+            errors.append(f"Expected {self.EXPECTED_BAND_COUNT} bands, found {band_numbers.size}")
+
+        counts = np.bincount(band_numbers)
+        for band_num in np.flatnonzero(counts > 1):
+            errors.append(f"Duplicate band_number: {band_num}")
+
+        for position, band_name in enumerate(signature._band_names):
+            if not band_name:
+                errors.append(f"Band {band_numbers[position]}: Missing or empty band_name")
+
+        # None reflectance values become NaN in the float column; anything
+        # non-numeric would already have failed that conversion
+        for band_num in band_numbers[np.isnan(reflectance)]:
+            errors.append(f"Band {band_num}: reflectance_value is None")
+
+        # Out-of-range [0, 1] values are tolerated (may be scaled differently)
+
+        # Check band number sequence (the bands setter keeps them sorted)
+        if band_numbers.size == self.EXPECTED_BAND_COUNT:
+            expected_numbers = np.arange(1, self.EXPECTED_BAND_COUNT + 1)
+            if not np.array_equal(band_numbers, expected_numbers):
+                errors.append(f"Band numbers should be 1-{self.EXPECTED_BAND_COUNT}, "
+                              f"found: {band_numbers.tolist()}")
         
         # Check statistics if present
         if signature.statistics:
@@ -113,25 +115,34 @@ class SignatureValidator:
         except Exception as e:
             return False, [f"Error loading file: {str(e)}"]
     
-    def validate_directory(self, directory: Path, file_format: str = 'csv') -> Dict[str, Tuple[bool, List[str]]]:
+    def validate_directory(self, directory: Path, file_format: str = 'csv',
+                           max_workers: Optional[int] = None) -> Dict[str, Tuple[bool, List[str]]]:
         """Validate all signature files in a directory
-        
+
+        Files are validated in parallel worker processes since each one is
+        an independent parse + check; small directories stay serial because
+        process startup would cost more than the validation itself.
+
         Args:
             directory: Directory containing signature files
             file_format: 'csv' or 'json'
-        
+            max_workers: Optional cap on worker processes
+
         Returns:
             Dictionary mapping filename to (is_valid, errors)
         """
-        results = {}
-        
-        pattern = '*.csv' if file_format.lower() == 'csv' else '*.json'
-        
-        for filepath in directory.glob(pattern):
-            is_valid, errors = self.validate_file(filepath, file_format)
-            results[filepath.name] = (is_valid, errors)
-        
-        return results
+        suffix = '.csv' if file_format.lower() == 'csv' else '.json'
+        filepaths = [filepath for filepath in directory.iterdir()
+                     if filepath.suffix == suffix and filepath.is_file()]
+
+        if len(filepaths) < 8:
+            return {filepath.name: self.validate_file(filepath, file_format)
+                    for filepath in filepaths}
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            validations = executor.map(_validate_one,
+                                       [(filepath, file_format) for filepath in filepaths])
+            return dict(zip((filepath.name for filepath in filepaths), validations))
     
     def check_quality(self, signature: SpectralSignature) -> Dict[str, any]:
         """Check signature quality metrics
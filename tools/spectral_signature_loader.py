@@ -6,72 +6,255 @@ Load spectral signatures from CSV or JSON files
 """
 
 import csv
+import hashlib
 import json
+import operator
 import numpy as np
 from pathlib import Path
 from typing import Dict, List, Optional, Union
 
+try:
+    import pandas as pd
+    PANDAS_AVAILABLE = True
+except ImportError:
+    PANDAS_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+from _fast_metrics import value_stats
+from _kernels import compute_cr_and_indices
+
+# C-implemented sort key; tolerates band dicts missing 'band_number'
+_BAND_NUMBER_KEY = operator.methodcaller('get', 'band_number', 0)
+
+
+def _csv_cell(value) -> str:
+    """Format one CSV cell the way the csv module's excel dialect does"""
+    if value is None:
+        return ''
+    text = str(value)
+    if '"' in text:
+        return '"' + text.replace('"', '""') + '"'
+    if ',' in text or '\n' in text or '\r' in text:
+        return '"' + text + '"'
+    return text
+
+
+def _read_json(filepath: Path) -> Dict:
+    """Parse a JSON file, with orjson when installed (2-5x faster)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(filepath.read_bytes())
+    with open(filepath, 'r') as f:
+        return json.load(f)
+
+
+def _write_json(data: Dict, filepath: Path):
+    """Serialize a dict to a JSON file, with orjson when installed
+
+    Band and statistics values are plain Python floats by the time they
+    reach serialization, so both backends produce equivalent output.
+    """
+    if ORJSON_AVAILABLE:
+        filepath.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(filepath, 'w') as f:
+            json.dump(data, f, indent=2)
+
+
+def _float_column(values: List, dtype=np.float32) -> np.ndarray:
+    """Build a read-only float column with NaN for missing entries
+
+    float32 is the default: reflectance values carry ~3 significant
+    decimals, so single precision halves the memory traffic of batch
+    comparisons without losing information.
+    """
+    column = np.array([np.nan if v is None else v for v in values],
+                      dtype=dtype)
+    column.setflags(write=False)
+    return column
+
 
 class SpectralSignature:
-    """Represents a spectral signature with metadata"""
-    
-    def __init__(self, signature_id: str, category: str, bands: List[Dict], 
+    """Represents a spectral signature with metadata
+
+    Band data is held as parallel per-field arrays (structure-of-arrays),
+    sorted by band number at construction. Assigning to `bands` re-sorts
+    and rebuilds the arrays, so the sorted invariant holds through
+    mutation and accessors never need to sort. The `bands` list-of-dicts
+    view is materialized lazily for serialization and backward
+    compatibility.
+    """
+
+    def __init__(self, signature_id: str, category: str, bands: List[Dict],
                  location: Optional[Dict] = None, source: Optional[Dict] = None,
                  statistics: Optional[Dict] = None, metadata: Optional[Dict] = None):
         self.signature_id = signature_id
         self.category = category
+        self._version = 0
+        self._values_cache = {}
         self.bands = bands
         self.location = location or {}
         self.source = source or {}
         self.statistics = statistics or {}
         self.metadata = metadata or {}
-    
+
+    @property
+    def bands(self) -> List[Dict]:
+        if self._bands_cache is None:
+            self._bands_cache = self._materialize_bands()
+        return self._bands_cache
+
+    @bands.setter
+    def bands(self, value: List[Dict]):
+        # Sort once here; every accessor and the materialized view rely
+        # on the band-number ordering, so no per-call sorts are needed
+        value = sorted(value, key=_BAND_NUMBER_KEY)
+        self._band_numbers = np.array([b.get('band_number', 0) for b in value],
+                                      dtype=np.int16)
+        self._band_names = [b.get('band_name', '') for b in value]
+        self._notes = [b.get('notes', '') for b in value]
+        self._wavelengths = _float_column([b.get('wavelength_um') for b in value],
+                                          dtype=np.float64)
+        self._reflectance = _float_column([b.get('reflectance_value') for b in value])
+        self._continuum_removed = _float_column([b.get('continuum_removed') for b in value])
+        self._index_values = _float_column([b.get('index_value') for b in value])
+        self._band_index = {int(num): i for i, num in enumerate(self._band_numbers)}
+        self._name_index = {name: i for i, name in enumerate(self._band_names)}
+        self._bands_cache = None
+        self._version += 1
+        self._values_cache.clear()
+
+    def _materialize_bands(self) -> List[Dict]:
+        """Rebuild the list-of-dicts band view from the backing arrays"""
+        def optional(value):
+            # Round away float32 representation noise at the boundary
+            return None if np.isnan(value) else round(float(value), 6)
+
+        return [
+            {
+                'band_number': int(number),
+                'band_name': name,
+                'wavelength_um': optional(wavelength),
+                'reflectance_value': optional(refl),
+                'continuum_removed': optional(cr),
+                'index_value': optional(idx),
+                'notes': notes
+            }
+            for number, name, wavelength, refl, cr, idx, notes in zip(
+                self._band_numbers, self._band_names, self._wavelengths,
+                self._reflectance, self._continuum_removed,
+                self._index_values, self._notes)
+        ]
+
+    def _band_position(self, band_number: int) -> Optional[int]:
+        """Map a band number to its array position"""
+        return self._band_index.get(band_number)
+
     def get_band_value(self, band_number: int) -> Optional[float]:
         """Get reflectance value for a specific band number"""
-        for band in self.bands:
-            if band.get('band_number') == band_number:
-                return band.get('reflectance_value')
-        return None
-    
+        position = self._band_position(band_number)
+        if position is None:
+            return None
+        value = self._reflectance[position]
+        return None if np.isnan(value) else round(float(value), 6)
+
     def get_band_by_name(self, band_name: str) -> Optional[Dict]:
-        """Get band data by band name"""
-        for band in self.bands:
-            if band.get('band_name') == band_name:
-                return band
-        return None
-    
+        """Get band data by band name (O(1) via the name index)"""
+        position = self._name_index.get(band_name)
+        if position is None:
+            return None
+        return self.bands[position]
+
     def get_index_value(self, band_number: int) -> Optional[float]:
         """Get index value for gold pathfinder bands (13-18)"""
-        for band in self.bands:
-            if band.get('band_number') == band_number:
-                return band.get('index_value')
-        return None
-    
+        position = self._band_position(band_number)
+        if position is None:
+            return None
+        value = self._index_values[position]
+        return None if np.isnan(value) else round(float(value), 6)
+
+    def set_index_value(self, band_number: int, value: Optional[float]):
+        """Set the index value for a band, invalidating cached views"""
+        position = self._band_position(band_number)
+        if position is None:
+            raise ValueError(f"Unknown band_number: {band_number}")
+
+        self._index_values.setflags(write=True)
+        self._index_values[position] = np.nan if value is None else value
+        self._index_values.setflags(write=False)
+        self._bands_cache = None
+        self._version += 1
+        self._values_cache.clear()
+
     def get_all_values(self, value_type: str = 'reflectance') -> np.ndarray:
         """Get all band values as numpy array
-        
+
+        Returns the read-only backing array for the requested field
+        (NaN marks missing values), so repeated calls are O(1).
+
         Args:
             value_type: 'reflectance', 'continuum_removed', or 'index'
         """
-        values = []
-        for band in sorted(self.bands, key=lambda x: x.get('band_number', 0)):
-            if value_type == 'reflectance':
-                values.append(band.get('reflectance_value', 0.0))
-            elif value_type == 'continuum_removed':
-                values.append(band.get('continuum_removed', 0.0))
-            elif value_type == 'index':
-                values.append(band.get('index_value', 0.0))
-            else:
-                values.append(band.get('reflectance_value', 0.0))
-        return np.array(values)
-    
+        if value_type == 'continuum_removed':
+            return self._continuum_removed
+        if value_type == 'index':
+            return self._index_values
+        return self._reflectance
+
+    def get_all_values_merged(self) -> np.ndarray:
+        """Get reflectance values with index-value fallback as numpy array
+
+        Bands without a usable reflectance value (missing or 0.0, as for
+        the gold pathfinder bands) fall back to their index value; bands
+        with neither are NaN.
+        """
+        cached = self._values_cache.get('merged')
+        if cached is not None:
+            return cached
+
+        use_index = np.isnan(self._reflectance) | (self._reflectance == 0)
+        result = np.where(use_index, self._index_values, self._reflectance)
+        result.setflags(write=False)
+        self._values_cache['merged'] = result
+        return result
+
+    @property
+    def sorted_band_numbers(self) -> List[int]:
+        """Band numbers in ascending order, as plain ints (cached)"""
+        cached = self._values_cache.get('sorted_band_numbers')
+        if cached is None:
+            cached = [int(number) for number in self._band_numbers]
+            self._values_cache['sorted_band_numbers'] = cached
+        return cached
+
+    @property
+    def merged_values(self) -> np.ndarray:
+        """Reflectance values with index-value fallback (cached, read-only)"""
+        return self.get_all_values_merged()
+
+    @property
+    def content_hash(self) -> bytes:
+        """Digest of the numeric band content, for duplicate detection
+
+        Signatures with equal hashes carry identical reflectance and
+        index vectors even if their ids differ.
+        """
+        cached = self._values_cache.get('content_hash')
+        if cached is None:
+            cached = hashlib.blake2b(
+                self._reflectance.tobytes() + self._index_values.tobytes(),
+                digest_size=16).digest()
+            self._values_cache['content_hash'] = cached
+        return cached
+
     def get_wavelengths(self) -> np.ndarray:
-        """Get all wavelengths as numpy array"""
-        wavelengths = []
-        for band in sorted(self.bands, key=lambda x: x.get('band_number', 0)):
-            wavelengths.append(band.get('wavelength_um', 0.0))
-        return np.array(wavelengths)
-    
+        """Get all wavelengths as numpy array (NaN for index bands)"""
+        return self._wavelengths
+
     def to_dict(self) -> Dict:
         """Convert signature to dictionary"""
         return {
@@ -84,35 +267,52 @@ class SpectralSignature:
             'metadata': self.metadata
         }
     
+    CSV_FIELDS = ['band_number', 'band_name', 'wavelength_um',
+                  'reflectance_value', 'continuum_removed', 'index_value', 'notes']
+
+    def _csv_text(self, bands: List[Dict]) -> str:
+        """Render header plus band rows as one CSV string
+
+        Formats cells directly instead of going through DictWriter,
+        which re-resolves field ordering and dispatches a Python call
+        per row; output stays byte-identical to the excel dialect.
+        """
+        rows = [','.join(self.CSV_FIELDS)]
+        rows.extend(','.join(_csv_cell(band[field]) for field in self.CSV_FIELDS)
+                    for band in bands)
+        return '\r\n'.join(rows) + '\r\n'
+
     def save_csv(self, filepath: Union[str, Path]):
         """Save signature to CSV file"""
         filepath = Path(filepath)
         filepath.parent.mkdir(parents=True, exist_ok=True)
-        
+
         with open(filepath, 'w', newline='') as f:
-            fieldnames = ['band_number', 'band_name', 'wavelength_um', 
-                          'reflectance_value', 'continuum_removed', 'index_value', 'notes']
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            for band in sorted(self.bands, key=lambda x: x.get('band_number', 0)):
-                writer.writerow({
-                    'band_number': band.get('band_number', ''),
-                    'band_name': band.get('band_name', ''),
-                    'wavelength_um': band.get('wavelength_um', ''),
-                    'reflectance_value': band.get('reflectance_value', ''),
-                    'continuum_removed': band.get('continuum_removed', ''),
-                    'index_value': band.get('index_value', ''),
-                    'notes': band.get('notes', '')
-                })
-    
+            f.write(self._csv_text(self.bands))
+
     def save_json(self, filepath: Union[str, Path]):
         """Save signature to JSON file"""
         filepath = Path(filepath)
         filepath.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(filepath, 'w') as f:
-            json.dump(self.to_dict(), f, indent=2)
+
+        _write_json(self.to_dict(), filepath)
+
+    def save_both(self, stem: Union[str, Path]):
+        """Save signature to <stem>.csv and <stem>.json in one pass
+
+        The band records are materialized once and shared by both
+        writers, so paired exports pay the serialization setup only once.
+
+        Args:
+            stem: Output path without extension
+        """
+        stem = Path(stem)
+        stem.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(stem.with_suffix('.csv'), 'w', newline='') as f:
+            f.write(self._csv_text(self.bands))
+
+        _write_json(self.to_dict(), stem.with_suffix('.json'))
 
 
 class SpectralSignatureLoader:
@@ -142,6 +342,50 @@ class SpectralSignatureLoader:
         {'band_number': 18, 'band_name': 'Gold_Advanced_Argillic', 'wavelength_um': None},
     ]
     
+    @staticmethod
+    def _read_csv_bands_pandas(filepath: Path) -> List[Dict]:
+        """Parse CSV band rows with pandas' C parser"""
+        df = pd.read_csv(filepath)
+        # Coerce numeric columns once at parse time; a bad cell becomes
+        # NaN here instead of a string that the float columns (and every
+        # later validation pass) would choke on
+        for column in ('wavelength_um', 'reflectance_value',
+                       'continuum_removed', 'index_value'):
+            if column in df.columns:
+                df[column] = pd.to_numeric(df[column], errors='coerce')
+        for column, default in (('band_name', ''), ('notes', ''),
+                                ('reflectance_value', 0.0)):
+            if column in df.columns:
+                df[column] = df[column].fillna(default)
+        # Remaining NaNs (wavelengths, optional columns) map to None
+        # downstream when the band view is materialized
+        return df.to_dict('records')
+
+    @staticmethod
+    def _read_csv_bands_stdlib(filepath: Path) -> List[Dict]:
+        """Parse CSV band rows with the stdlib csv module"""
+        def coerce(text, default=None):
+            # Parse-time coercion mirroring pd.to_numeric(errors='coerce')
+            try:
+                return float(text) if text else default
+            except ValueError:
+                return default
+
+        bands = []
+        with open(filepath, 'r') as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                bands.append({
+                    'band_number': int(row.get('band_number', 0)),
+                    'band_name': row.get('band_name', ''),
+                    'wavelength_um': coerce(row.get('wavelength_um')),
+                    'reflectance_value': coerce(row.get('reflectance_value'), 0.0),
+                    'continuum_removed': coerce(row.get('continuum_removed')),
+                    'index_value': coerce(row.get('index_value')),
+                    'notes': row.get('notes', '')
+                })
+        return bands
+
     def load_csv(self, filepath: Union[str, Path]) -> SpectralSignature:
         """Load signature from CSV file"""
         filepath = Path(filepath)
@@ -149,35 +393,30 @@ class SpectralSignatureLoader:
         if not filepath.exists():
             raise FileNotFoundError(f"Signature file not found: {filepath}")
         
-        bands = []
         signature_id = filepath.stem
         category = filepath.parent.name
-        
-        with open(filepath, 'r') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                band_data = {
-                    'band_number': int(row.get('band_number', 0)),
-                    'band_name': row.get('band_name', ''),
-                    'wavelength_um': float(row.get('wavelength_um', 0)) if row.get('wavelength_um') else None,
-                    'reflectance_value': float(row.get('reflectance_value', 0)) if row.get('reflectance_value') else 0.0,
-                    'continuum_removed': float(row.get('continuum_removed', 0)) if row.get('continuum_removed') else None,
-                    'index_value': float(row.get('index_value', 0)) if row.get('index_value') else None,
-                    'notes': row.get('notes', '')
-                }
-                bands.append(band_data)
-        
-        # Calculate statistics
-        reflectance_values = [b['reflectance_value'] for b in bands if b['reflectance_value']]
+
+        if PANDAS_AVAILABLE:
+            bands = self._read_csv_bands_pandas(filepath)
+        else:
+            bands = self._read_csv_bands_stdlib(filepath)
+
+        # Calculate statistics in a single pass over the reflectance
+        # values; fromiter fills the array straight from the generator
+        # without an intermediate Python list
+        reflectance_values = np.fromiter(
+            (b['reflectance_value'] for b in bands if b['reflectance_value']),
+            dtype=np.float64)
         statistics = {}
-        if reflectance_values:
+        if reflectance_values.size:
+            mean, std, minimum, maximum = value_stats(reflectance_values)
             statistics = {
-                'mean_reflectance': np.mean(reflectance_values),
-                'std_reflectance': np.std(reflectance_values),
-                'min_reflectance': np.min(reflectance_values),
-                'max_reflectance': np.max(reflectance_values)
+                'mean_reflectance': mean,
+                'std_reflectance': std,
+                'min_reflectance': minimum,
+                'max_reflectance': maximum
             }
-        
+
         return SpectralSignature(
             signature_id=signature_id,
             category=category,
@@ -192,9 +431,8 @@ class SpectralSignatureLoader:
         if not filepath.exists():
             raise FileNotFoundError(f"Signature file not found: {filepath}")
         
-        with open(filepath, 'r') as f:
-            data = json.load(f)
-        
+        data = _read_json(filepath)
+
         return SpectralSignature(
             signature_id=data.get('signature_id', filepath.stem),
             category=data.get('category', 'unknown'),
@@ -211,21 +449,123 @@ class SpectralSignatureLoader:
         signatures = []
         
         if file_format.lower() == 'csv':
-            pattern = '*.csv'
+            suffix = '.csv'
             loader_func = self.load_csv
         else:
-            pattern = '*.json'
+            suffix = '.json'
             loader_func = self.load_json
-        
-        for filepath in directory.glob(pattern):
+
+        # iterdir with a suffix check skips glob's fnmatch machinery
+        for filepath in directory.iterdir():
+            if filepath.suffix != suffix or not filepath.is_file():
+                continue
             try:
                 signature = loader_func(filepath)
                 signatures.append(signature)
             except Exception as e:
                 print(f"Warning: Could not load {filepath}: {e}")
-        
+
         return signatures
 
+    def load_all_matrix(self, directory: Union[str, Path],
+                        file_format: str = 'csv') -> Dict:
+        """Load all signatures from a directory into stacked matrices
+
+        Batch workloads (validation sweeps, catalog-wide statistics,
+        similarity scans) don't need N separate signature objects; this
+        returns one contiguous (N, 18) float32 matrix per value column,
+        so downstream reductions are single vectorized calls
+        (e.g. reflectance.mean(axis=1)).
+
+        Args:
+            directory: Directory containing signature files
+            file_format: 'csv' or 'json'
+
+        Returns:
+            Dictionary with 'signature_ids', 'categories', 'reflectance',
+            'continuum_removed', and 'index_values' keys
+        """
+        signatures = self.load_all(directory, file_format)
+        n = len(signatures)
+        n_bands = len(self.ASTER_BANDS)
+
+        reflectance = np.full((n, n_bands), np.nan, dtype=np.float32)
+        continuum_removed = np.full((n, n_bands), np.nan, dtype=np.float32)
+        index_values = np.full((n, n_bands), np.nan, dtype=np.float32)
+
+        for i, signature in enumerate(signatures):
+            for matrix, value_type in ((reflectance, 'reflectance'),
+                                       (continuum_removed, 'continuum_removed'),
+                                       (index_values, 'index')):
+                values = signature.get_all_values(value_type)
+                matrix[i, :min(values.size, n_bands)] = values[:n_bands]
+
+        # Derive continuum-removed and index columns in bulk for files
+        # that only carried raw reflectance; the CR values land in the
+        # CR band slots (7-12) and the ratios in the index slots (13-18)
+        missing = (np.isnan(continuum_removed).all(axis=1)
+                   & np.isnan(index_values).all(axis=1)
+                   & np.isfinite(reflectance[:, :6]).all(axis=1))
+        if missing.any():
+            cr, derived = compute_cr_and_indices(reflectance[missing, :6])
+            continuum_removed[np.ix_(np.flatnonzero(missing), np.arange(6, 12))] = cr
+            index_values[np.ix_(np.flatnonzero(missing), np.arange(12, 18))] = derived
+
+        return {
+            'signature_ids': [sig.signature_id for sig in signatures],
+            'categories': [sig.category for sig in signatures],
+            'reflectance': reflectance,
+            'continuum_removed': continuum_removed,
+            'index_values': index_values
+        }
+
+    @staticmethod
+    def save_matrix_npz(matrix: Dict, filepath: Union[str, Path]):
+        """Archive a load_all_matrix result as a compressed .npz
+
+        Reflectance lives in [0, 1] with ~3 significant figures, so it
+        is quantized to uint16 (scale 65535, values clipped to range)
+        for a 4x size cut, with NaN slots kept in a separate mask.
+        Continuum-removed and index columns stay float32 since their
+        ranges are unbounded.
+
+        Args:
+            matrix: Dictionary as returned by load_all_matrix
+            filepath: Destination .npz path
+        """
+        reflectance = matrix['reflectance']
+        nan_mask = np.isnan(reflectance)
+        quantized = np.clip(np.where(nan_mask, 0.0, reflectance), 0.0, 1.0)
+        np.savez_compressed(
+            filepath,
+            signature_ids=np.array(matrix['signature_ids']),
+            categories=np.array(matrix['categories']),
+            reflectance_u16=np.round(quantized * 65535).astype(np.uint16),
+            reflectance_nan=nan_mask,
+            continuum_removed=matrix['continuum_removed'],
+            index_values=matrix['index_values'])
+
+    @staticmethod
+    def load_matrix_npz(filepath: Union[str, Path]) -> Dict:
+        """Load a matrix archive written by save_matrix_npz
+
+        Args:
+            filepath: Path to the .npz archive
+
+        Returns:
+            Dictionary with the same keys as load_all_matrix
+        """
+        with np.load(filepath) as data:
+            reflectance = data['reflectance_u16'].astype(np.float32) / np.float32(65535)
+            reflectance[data['reflectance_nan']] = np.nan
+            return {
+                'signature_ids': data['signature_ids'].tolist(),
+                'categories': data['categories'].tolist(),
+                'reflectance': reflectance,
+                'continuum_removed': data['continuum_removed'],
+                'index_values': data['index_values']
+            }
+
 
 if __name__ == "__main__":
     # Example usage